@@ -4,6 +4,7 @@ import math
 import json
 import sys
 import addon_utils
+import numpy as np
 from mathutils import Vector
 
 # Enable Import X add-on
@@ -36,6 +37,20 @@ DIMENSION_Y = 400 # Render dimension Y
 FOCAL_LENGTH = 600
 CAM_INDEX = 0
 
+# ---- Config: QA pass ---- #
+QA = False # True will render a fast low resolution pass and build contact sheets instead of final renders
+QA_OUTPUT_PATH = os.path.join(OUTPUT_PATH, "qa") # Where QA frames, contact sheets and the report are saved
+QA_RENDER_ENGINE = "BLENDER_WORKBENCH"
+QA_DIMENSION = 64 # Render dimension of each QA frame
+QA_ALPHA_THRESHOLD = 0.05 # Minimum alpha for a pixel to count as covered
+QA_EDGE_MARGIN = 1 # Width in pixels of the border that must stay empty
+QA_SHEET_COLUMNS = 10 # Frames per row on a contact sheet
+QA_SHEET_ROWS = 8 # Rows per contact sheet page
+QA_SHEET_SCALE = 128 # Pixels per frame tile on the contact sheet
+QA_SHEET_BACKGROUND = (0.05, 0.05, 0.05) # Sheet background colour
+QA_TILE_COLOUR = (0.5, 0.5, 0.5) # Colour behind each frame's transparent pixels
+QA_FLAG_COLOUR = (0.9, 0.05, 0.05, 1.0) # Frame colour drawn around flagged tiles
+
 # ---- Config: CLI Presets ---- #
 PRESETS = {
     "huge-0": {"focal_length": 200, "cam_index": 0},
@@ -62,7 +77,7 @@ PRESETS = {
 
 # ------------------------- CLI Argument Parsing ------------------------- #
 def cli_parsing():
-    global IS_SINGLE, RENDER_ENGINE, DIMENSION_X, DIMENSION_Y, FOCAL_LENGTH, CAM_INDEX, MODELS, PRESET
+    global IS_SINGLE, RENDER_ENGINE, DIMENSION_X, DIMENSION_Y, FOCAL_LENGTH, CAM_INDEX, MODELS, PRESET, QA
     preset = None
 
     args = sys.argv
@@ -95,6 +110,8 @@ def cli_parsing():
         elif arg.startswith("models="):
             models = arg.split("=", 1)[1]
             MODELS.extend(v.strip() for v in models.split(",") if v.strip())
+        elif arg.startswith("qa="):
+            QA = arg.split("=", 1)[1].lower() == "true"
     
     # Apply presets
     if preset in PRESETS:
@@ -108,6 +125,13 @@ def cli_parsing():
             FOCAL_LENGTH = value if key == "focal_length" else FOCAL_LENGTH
             CAM_INDEX = value if key == "cam_index" else CAM_INDEX
 
+    # QA pass overrides the render quality, but keeps the lens and camera
+    if QA:
+        IS_SINGLE = True
+        RENDER_ENGINE = QA_RENDER_ENGINE
+        DIMENSION_X = QA_DIMENSION
+        DIMENSION_Y = QA_DIMENSION
+
 ## ------------------------- Scene cleanup ------------------------- ##
 def clear_scene():
     bpy.ops.object.select_all(action='SELECT')
@@ -237,9 +261,11 @@ def render_model(id_type, model_data):
 
     except Exception as e:
         print(f"Failed to import or apply texture: {id_type}\n{e}")
-        return
+        return []
     
     scene = bpy.context.scene
+    output_path = QA_OUTPUT_PATH if QA else OUTPUT_PATH
+    render_paths = []
 
     # Add sun
     if not any(obj.type == 'LIGHT' for obj in scene.objects):
@@ -254,6 +280,9 @@ def render_model(id_type, model_data):
     scene_render.engine = RENDER_ENGINE
     scene_render.image_settings.file_format = 'PNG'
     scene_render.film_transparent = True
+    if RENDER_ENGINE == "BLENDER_WORKBENCH":
+        scene.display.shading.light = 'STUDIO'
+        scene.display.shading.color_type = 'TEXTURE'
 
     # Camera position
     radius = 12
@@ -286,20 +315,194 @@ def render_model(id_type, model_data):
             filename = f"{id_type}_Model.png"
         else:
             filename = f"{id_type}_{i}_Model.png"
-        render_path = os.path.join(OUTPUT_PATH, filename)
+        render_path = os.path.join(output_path, filename)
         scene_render.filepath = render_path
 
         bpy.ops.render.render(write_still=True)
+        render_paths.append(render_path)
         if IS_SINGLE:
             print(f"[{id_type}] Render saved: {filename}")
         else:
             print(f"[{id_type}] Render {i+1}/{count} saved: {filename}")
 
+    return render_paths
+
+## ------------------------- QA pass ------------------------- ##
+def read_pixels(image):
+    """Return an image's pixels as a (height, width, 4) float array."""
+    width, height = image.size
+    pixels = np.empty(width * height * 4, dtype=np.float32)
+    image.pixels.foreach_get(pixels)
+    return pixels.reshape(height, width, 4)
+
+def check_frame(render_path):
+    """Return the QA flag for a rendered frame, or None if it looks fine."""
+    if not render_path or not os.path.exists(render_path):
+        return "FAILED"
+
+    image = bpy.data.images.load(render_path)
+    covered = read_pixels(image)[:, :, 3] > QA_ALPHA_THRESHOLD
+    bpy.data.images.remove(image)
+
+    if not covered.any():
+        return "EMPTY"
+
+    m = QA_EDGE_MARGIN
+    if covered[:m].any() or covered[-m:].any() or covered[:, :m].any() or covered[:, -m:].any():
+        return "EDGE"
+
+    return None
+
+def load_thumbnail(render_path):
+    """Load a QA frame, flattened over the tile colour so transparent areas stay visible."""
+    image = bpy.data.images.load(render_path)
+    pixels = read_pixels(image)
+    alpha = pixels[:, :, 3:4]
+    pixels[:, :, :3] = pixels[:, :, :3] * alpha + np.array(QA_TILE_COLOUR, dtype=np.float32) * (1 - alpha)
+    pixels[:, :, 3] = 1.0
+    image.pixels.foreach_set(pixels.ravel())
+    image.update()
+    return image
+
+def solid_material(name, colour):
+    mat = bpy.data.materials.new(name=name)
+    mat.diffuse_color = colour
+    return mat
+
+def add_sheet_tile(image, location):
+    bpy.ops.mesh.primitive_plane_add(size=1, location=location)
+    plane = bpy.context.object
+
+    if image is None:
+        plane.data.materials.append(solid_material("QATileMissing", (0.2, 0.0, 0.0, 1.0)))
+        return plane
+
+    mat = bpy.data.materials.new(name="QATileMat")
+    mat.use_nodes = True
+    plane.data.materials.append(mat)
+
+    nodes = mat.node_tree.nodes
+    links = mat.node_tree.links
+    nodes.clear()
+
+    tex = nodes.new("ShaderNodeTexImage")
+    tex.image = image
+    tex.interpolation = 'Closest'
+    bsdf = nodes.new("ShaderNodeBsdfPrincipled")
+    output = nodes.new("ShaderNodeOutputMaterial")
+
+    tex.location = (-400, 0)
+    bsdf.location = (0, 0)
+    output.location = (400, 0)
+
+    links.new(tex.outputs["Color"], bsdf.inputs["Base Color"])
+    links.new(bsdf.outputs["BSDF"], output.inputs["Surface"])
+    return plane
+
+def add_sheet_label(text, location, max_width, material):
+    bpy.ops.object.text_add(location=location)
+    label = bpy.context.object
+    label.data.body = text
+    label.data.align_x = 'CENTER'
+    label.data.size = 0.14
+    label.data.materials.append(material)
+
+    # Shrink long IDs so they stay within their tile
+    bpy.context.view_layer.update()
+    if label.dimensions.x > max_width:
+        factor = max_width / label.dimensions.x
+        label.scale = (factor, factor, 1)
+
+    return label
+
+def render_contact_sheet(entries, page, page_count):
+    """Render one page of QA frames as a grid labelled with the model IDs."""
+    clear_scene()
+    scene = bpy.context.scene
+
+    cell_w = 1.1
+    cell_h = 1.4
+    columns = min(QA_SHEET_COLUMNS, len(entries))
+    rows = math.ceil(len(entries) / QA_SHEET_COLUMNS)
+
+    label_mat = solid_material("QALabel", (1.0, 1.0, 1.0, 1.0))
+    flag_mat = solid_material("QAFlag", QA_FLAG_COLOUR)
+    thumbnails = []
+
+    for i, (id_type, render_path, flag) in enumerate(entries):
+        x = (i % QA_SHEET_COLUMNS) * cell_w
+        y = -(i // QA_SHEET_COLUMNS) * cell_h
+
+        image = None
+        if flag != "FAILED":
+            image = load_thumbnail(render_path)
+            thumbnails.append(image)
+        add_sheet_tile(image, (x, y, 0))
+
+        if flag:
+            bpy.ops.mesh.primitive_plane_add(size=1.08, location=(x, y, -0.01))
+            bpy.context.object.data.materials.append(flag_mat)
+
+        text = f"{id_type} [{flag}]" if flag else id_type
+        add_sheet_label(text, (x, y - 0.68, 0), cell_w - 0.05, flag_mat if flag else label_mat)
+
+    # Orthographic camera framing the whole grid
+    width = columns * cell_w
+    height = rows * cell_h
+    top = 0.55
+    bottom = top - height
+    bpy.ops.object.camera_add(location=((columns - 1) * cell_w / 2, (top + bottom) / 2, 10))
+    cam = bpy.context.object
+    cam.data.type = 'ORTHO'
+    cam.data.ortho_scale = max(width, height)
+    scene.camera = cam
+
+    # Render settings
+    scene_render = scene.render
+    scene_render.resolution_x = round(width * QA_SHEET_SCALE)
+    scene_render.resolution_y = round(height * QA_SHEET_SCALE)
+    scene_render.resolution_percentage = 100
+    scene_render.engine = "BLENDER_WORKBENCH"
+    scene_render.image_settings.file_format = 'PNG'
+    scene_render.film_transparent = False
+    scene.display.shading.light = 'FLAT'
+    scene.display.shading.color_type = 'TEXTURE'
+    scene.view_settings.view_transform = 'Standard'
+    if scene.world:
+        scene.world.color = QA_SHEET_BACKGROUND
+
+    filename = f"qa_sheet_{page:03d}.png"
+    scene_render.filepath = os.path.join(QA_OUTPUT_PATH, filename)
+    bpy.ops.render.render(write_still=True)
+    print(f"[QA] Contact sheet {page}/{page_count} saved: {filename}")
+
+    for image in thumbnails:
+        bpy.data.images.remove(image)
+
+def build_contact_sheets(qa_results):
+    """Tile QA frames into paged contact sheets and write a report of flagged models."""
+    per_page = QA_SHEET_COLUMNS * QA_SHEET_ROWS
+    page_count = math.ceil(len(qa_results) / per_page)
+
+    for page in range(page_count):
+        entries = qa_results[page * per_page:(page + 1) * per_page]
+        render_contact_sheet(entries, page + 1, page_count)
+
+    flagged = [(i, entry) for i, entry in enumerate(qa_results) if entry[2]]
+    report_path = os.path.join(QA_OUTPUT_PATH, "qa_report.txt")
+    with open(report_path, 'w', encoding='utf-8') as f:
+        for i, (id_type, render_path, flag) in flagged:
+            f.write(f"{id_type}\t{flag}\tqa_sheet_{i // per_page + 1:03d}.png\n")
+
+    print(f"[QA] {len(flagged)}/{len(qa_results)} models flagged. Report saved: {report_path}")
+
 ## ------------------------- Process vehicles ------------------------- ##
 def process_vehicles(model_list=None):
     with open(MODEL_DATA_PATH, 'r', encoding='utf-8') as f:
         all_models = json.load(f)
 
+    qa_results = []
+
     for model_id, model_data in all_models.items():
         id_type = model_id
 
@@ -308,9 +511,22 @@ def process_vehicles(model_list=None):
 
         if not model_data.get("mesh"):
             print(f"Missing mesh for {model_id}, skipping.")
+            if QA:
+                qa_results.append((id_type, None, "FAILED"))
             continue
 
-        render_model(id_type, model_data)
+        render_paths = render_model(id_type, model_data)
+
+        if QA:
+            render_path = render_paths[0] if render_paths else None
+            flag = check_frame(render_path)
+            if flag:
+                print(f"[{id_type}] QA flagged: {flag}")
+            qa_results.append((id_type, render_path, flag))
+
+    if QA and qa_results:
+        os.makedirs(QA_OUTPUT_PATH, exist_ok=True)
+        build_contact_sheets(qa_results)
 
 ## ------------------------- Initialise ------------------------- ##
 cli_parsing()
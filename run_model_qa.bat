@@ -0,0 +1,2 @@
+blender --background --python model_render.py -- preset=med-0 qa=true
+pause
\ No newline at end of file